@@ -147,30 +147,34 @@ from ansible_collections.community.general.plugins.module_utils.opennebula impor
 
 
 class TemplateModule(OpenNebulaModule):
-    def __init__(self):
-        argument_spec = dict(
-            id=dict(type='int', required=False),
-            name=dict(type='str', required=False),
-            state=dict(type='str', choices=['present', 'absent'], default='present'),
-            template=dict(type='str', required=False),
-        )
+    argument_spec = dict(
+        id=dict(type='int', required=False),
+        name=dict(type='str', required=False),
+        state=dict(type='str', choices=['present', 'absent'], default='present'),
+        template=dict(type='str', required=False),
+    )
 
-        mutually_exclusive = [
-            ['id', 'name']
-        ]
+    mutually_exclusive = [
+        ['id', 'name']
+    ]
 
-        required_one_of = [('id', 'name')]
+    required_one_of = [('id', 'name')]
 
-        required_if = [
-            ['state', 'present', ['template']]
-        ]
+    required_if = [
+        ['state', 'present', ['template']]
+    ]
 
+    def __init__(self):
         OpenNebulaModule.__init__(self,
-                                  argument_spec,
+                                  self.argument_spec,
                                   supports_check_mode=True,
-                                  mutually_exclusive=mutually_exclusive,
-                                  required_one_of=required_one_of,
-                                  required_if=required_if)
+                                  mutually_exclusive=self.mutually_exclusive,
+                                  required_one_of=self.required_one_of,
+                                  required_if=self.required_if)
+
+        self._templatepool_cache = None
+        self._templates_by_id = None
+        self._templates_by_name = None
 
     def run(self, one, module, result):
         params = module.params
@@ -184,7 +188,7 @@ class TemplateModule(OpenNebulaModule):
         template = self.get_template_instance(id, name)
         needs_creation = False
         if not template and desired_state != 'absent':
-            if id:
+            if id is not None:
                 module.fail_json(msg="There is no template with id=" + str(id))
             else:
                 needs_creation = True
@@ -199,25 +203,38 @@ class TemplateModule(OpenNebulaModule):
 
         self.exit()
 
-    def get_template(self, predicate):
-        # -3 means "Resources belonging to the user"
-        # the other two parameters are used for pagination, -1 for both essentially means "return all"
-        pool = self.one.templatepool.info(-3, -1, -1)
+    def get_templatepool(self):
+        # the pool is fetched at most once between mutating calls, see invalidate_templatepool()
+        if self._templatepool_cache is None:
+            # -3 means "Resources belonging to the user"
+            # the other two parameters are used for pagination, -1 for both essentially means "return all"
+            self._templatepool_cache = self.one.templatepool.info(-3, -1, -1)
+
+            self._templates_by_id = {}
+            self._templates_by_name = {}
+            for template in self._templatepool_cache.VMTEMPLATE:
+                # pyone parses ID as int and the id option is type=int, so both sides of a lookup are ints
+                self._templates_by_id[template.ID] = template
+                # names are not unique, keep the first match like a linear scan would
+                self._templates_by_name.setdefault(template.NAME, template)
 
-        for template in pool.VMTEMPLATE:
-            if predicate(template):
-                return template
+        return self._templatepool_cache
 
-        return None
+    def invalidate_templatepool(self):
+        self._templatepool_cache = None
+        self._templates_by_id = None
+        self._templates_by_name = None
 
     def get_template_by_id(self, template_id):
-        return self.get_template(lambda template: (template.ID == template_id))
+        self.get_templatepool()
+        return self._templates_by_id.get(template_id)
 
     def get_template_by_name(self, name):
-        return self.get_template(lambda template: (template.NAME == name))
+        self.get_templatepool()
+        return self._templates_by_name.get(name)
 
     def get_template_instance(self, requested_id, requested_name):
-        if requested_id:
+        if requested_id is not None:
             return self.get_template_by_id(requested_id)
         else:
             return self.get_template_by_name(requested_name)
@@ -236,10 +253,15 @@ class TemplateModule(OpenNebulaModule):
         return info
 
     def create_template(self, name, template_data):
-        if not self.module.check_mode:
-            self.one.template.allocate("NAME = \"" + name + "\"\n" + template_data)
+        if self.module.check_mode:
+            # there is nothing to read back, the template was never allocated
+            return {'changed': True}
+
+        # escape embedded quotes so the name cannot terminate the NAME attribute early
+        template_id = self.one.template.allocate('NAME = "%s"\n%s' % (name.replace('"', '\\"'), template_data))
+        self.invalidate_templatepool()
 
-        result = self.get_template_info(self.get_template_by_name(name))
+        result = self.get_template_info(self.get_template_by_id(template_id))
         result['changed'] = True
 
         return result
@@ -248,6 +270,7 @@ class TemplateModule(OpenNebulaModule):
         if not self.module.check_mode:
             # 0 = replace the whole template
             self.one.template.update(template.ID, template_data, 0)
+            self.invalidate_templatepool()
 
         result = self.get_template_info(self.get_template_by_id(template.ID))
         if self.module.check_mode:
@@ -265,6 +288,7 @@ class TemplateModule(OpenNebulaModule):
 
         if not self.module.check_mode:
             self.one.template.delete(template.ID)
+            self.invalidate_templatepool()
 
         return {'changed': True}
 